@@ -1,8 +1,16 @@
 import streamlit as st
+import altair as alt
 import google.generativeai as genai
 import os
+import io
+import hashlib
 import pandas as pd
 import json
+import concurrent.futures
+import threading
+import time
+import numpy as np
+import numba
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -34,35 +42,112 @@ if st.button("Reset Demo", use_container_width=True, type="secondary", on_click=
 st.markdown("---")
 # --- END UPDATED SECTION ---
 
-# --- SECURE: Get API Key from Streamlit Secrets ---
-try:
-    API_KEY = os.getenv("GEMINI_API_KEY")
-    
-except FileNotFoundError:
-    st.error("CRITICAL ERROR: Could not find .streamlit/secrets.toml file.")
-    st.info("Please create this file and add your GEMINI_API_KEY.")
-    st.stop()
-except KeyError:
-    st.error("CRITICAL ERROR: 'GEMINI_API_KEY' not found in secrets.toml.")
-    st.info("Please add your Gemini API key to the .streamlit/secrets.toml file.")
-    st.stop()
+# --- SECURE: Get API Key and build the model once per server process ---
+MODEL_NAME = "gemini-2.5-flash"
+
+@st.cache_resource(show_spinner=False)
+def get_model(model_name=MODEL_NAME):
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(model_name)
+
+# Native JSON mode: Gemini returns bare JSON matching this schema, no fences.
+# It only supplies the causes; every figure in the report comes from the
+# local detection.
+CAUSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "sku": {"type": "string"},
+            "cause": {"type": "string"},
+        },
+        "required": ["sku", "cause"],
+    },
+}
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": CAUSE_SCHEMA,
+}
+
+# Answers are shared across sessions for an hour, keyed on (prompt, model).
+GEMINI_CACHE_TTL = 60 * 60
+GEMINI_CACHE_MAX_ENTRIES = 100
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_cache():
+    # Sessions run on separate threads, so the dict is guarded by a lock.
+    return threading.Lock(), {}
+
+def get_cached_response(prompt, model_name):
+    lock, entries = get_gemini_cache()
+    with lock:
+        entry = entries.get((prompt, model_name))
+    if entry is None:
+        return None
+    stored_at, text = entry
+    if time.time() - stored_at > GEMINI_CACHE_TTL:
+        return None
+    return text
+
+def set_cached_response(prompt, model_name, text):
+    lock, entries = get_gemini_cache()
+    now = time.time()
+    with lock:
+        entries.pop((prompt, model_name), None)
+        entries[(prompt, model_name)] = (now, text)
+        # Entries are kept oldest-first: drop expired ones, then trim to size.
+        for key, (stored_at, _) in list(entries.items()):
+            if now - stored_at > GEMINI_CACHE_TTL or len(entries) > GEMINI_CACHE_MAX_ENTRIES:
+                del entries[key]
+            else:
+                break
+
+# Stream the answer into `placeholder` as it arrives, unless an identical
+# prompt (same CSV, thresholds and context) was answered recently.
+def stream_gemini(prompt, placeholder, model_name=MODEL_NAME):
+    cached = get_cached_response(prompt, model_name)
+    if cached is not None:
+        return cached
+
+    # The sync client streams too, and unlike the async one it isn't tied
+    # to the event loop of the first call made on the cached model.
+    response = get_model(model_name).generate_content(
+        prompt, generation_config=GENERATION_CONFIG, stream=True
+    )
+    chunks = []
+    for chunk in response:
+        # A final chunk may carry only a finish reason; its .text would raise.
+        if not chunk.parts:
+            continue
+        chunks.append(chunk.text)
+        placeholder.code("".join(chunks), language="json")
+    text = "".join(chunks)
+    set_cached_response(prompt, model_name, text)
+    return text
 
-# Configure the API
 try:
-    genai.configure(api_key=API_KEY)
-    
-    model = genai.GenerativeModel("gemini-2.5-flash")
+    get_model()
 except Exception as e:
     st.error(f"Error configuring API: {e}")
     st.stop()
 # --- END SECURE KEY SECTION ---
 
 
+# --- FUNCTION: Pooled HTTP Session for Brevo ---
+# Reusing one session keeps the TLS connection to Brevo alive, so only the
+# first email pays for the handshake.
+BREVO_URL = "https://api.brevo.com/v3/smtp/email"
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    return requests.Session()
+# --- END NEW FUNCTION ---
+
+
 # --- FUNCTION: The Email Sender ---
 def send_email(recipient_email, subject, body):
     try:
         BREVO_API_KEY = os.getenv("BREVO_API_KEY")
-        st.write("Brevo Key Exists:", BREVO_API_KEY is not None)
         headers = {
             "accept": "application/json",
             "api-key": BREVO_API_KEY,
@@ -83,14 +168,12 @@ def send_email(recipient_email, subject, body):
             "htmlContent": f"<pre>{body}</pre>"
         }
 
-        response = requests.post(
-            "https://api.brevo.com/v3/smtp/email",
-            headers=headers,
-            json=payload
-        )
-
-        st.write("Status Code:", response.status_code)
-        st.write("Response:", response.text)
+        try:
+            response = get_http_session().post(BREVO_URL, headers=headers, json=payload)
+        except requests.ConnectionError:
+            # The pooled connection went stale; start a fresh session and retry once.
+            get_http_session.clear()
+            response = get_http_session().post(BREVO_URL, headers=headers, json=payload)
 
         if response.status_code in [200, 201]:
             return True, "Email sent successfully!"
@@ -102,6 +185,124 @@ def send_email(recipient_email, subject, body):
 # --- END NEW FUNCTION ---
 
 
+# --- FUNCTION: Cached CSV Loader ---
+# Streamlit reruns the whole script on every widget change; caching on the
+# uploaded bytes means the CSV is only parsed once per upload.
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def load_df(file_bytes):
+    df = pd.read_csv(io.BytesIO(file_bytes))
+    df.columns = df.columns.str.strip().str.lower()
+    # ISO dates take pandas' C fast path; anything else falls back to
+    # per-element format inference.
+    dates = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce', cache=True)
+    if dates.isna().any():
+        dates = pd.to_datetime(df['date'], format='mixed', errors='coerce', cache=True)
+    df['date'] = dates
+
+    # Narrower dtypes keep the frame small and the rolling math fast. Only
+    # integer sales are downcast; float32 would round decimal sales.
+    if pd.api.types.is_integer_dtype(df['sales']):
+        df['sales'] = pd.to_numeric(df['sales'], downcast='integer')
+    df['sku'] = df['sku'].astype('category')
+    if 'location' in df.columns:
+        df['location'] = df['location'].astype('category')
+    return df
+# --- END NEW FUNCTION ---
+
+
+# --- FUNCTION: Fused Spike/Slump Kernel ---
+# One pass per SKU computes the average of the previous 7 days, the % change
+# and a flag (1 = spike, -1 = slump, 0 = normal). Rows must be sorted by SKU
+# then date, with offsets[g]:offsets[g + 1] covering SKU g. Cached so the
+# JIT compile happens once per server process, not on every rerun.
+@st.cache_resource(show_spinner=False)
+def get_detect_kernel():
+    @numba.njit(nogil=True, parallel=True, error_model='numpy')
+    def detect(sales, offsets, spike_t, slump_t, out_avg, out_pct, out_flag):
+        for g in numba.prange(len(offsets) - 1):
+            start = offsets[g]
+            # Like pandas' rolling mean, missing sales are skipped: the
+            # average is over the valid values among the previous 7 rows.
+            window_sum = 0.0
+            window_count = 0
+            for i in range(start, offsets[g + 1]):
+                if window_count > 0:
+                    avg = window_sum / window_count
+                    pct = (sales[i] / avg - 1.0) * 100.0
+                    out_avg[i] = avg
+                    out_pct[i] = pct
+                    if pct > spike_t:
+                        out_flag[i] = 1
+                    elif pct < -slump_t:
+                        out_flag[i] = -1
+                if not np.isnan(sales[i]):
+                    window_sum += sales[i]
+                    window_count += 1
+                if i - start >= 7 and not np.isnan(sales[i - 7]):
+                    window_sum -= sales[i - 7]
+                    window_count -= 1
+    return detect
+# --- END NEW FUNCTION ---
+
+
+# --- FUNCTION: Local Spike/Slump Detection ---
+def detect_anomalies(df, alert_threshold, warn_on_slump, slump_threshold):
+    # The 7-day average is taken over the *previous* 7 days, so today's
+    # sales are compared against the history that led up to them.
+    df = df.sort_values(['sku', 'date'])
+    sizes = df.groupby('sku', observed=True).size().to_numpy()
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+    avg_sales = np.full(len(df), np.nan)
+    change_pct = np.full(len(df), np.nan)
+    flags = np.zeros(len(df), dtype=np.int8)
+    get_detect_kernel()(
+        df['sales'].to_numpy(dtype=np.float64),
+        offsets,
+        float(alert_threshold),
+        float(slump_threshold) if warn_on_slump else np.inf,
+        avg_sales,
+        change_pct,
+        flags,
+    )
+    df['avg_sales'] = avg_sales
+    df['change_pct'] = change_pct
+    df['type'] = np.where(flags == 1, 'spike', 'slump')
+
+    # Only the latest issue per SKU is reported.
+    anomalies = df[flags != 0].groupby('sku', observed=True).tail(1)
+    anomalies = anomalies.rename(columns={'sales': 'today_sales'})
+    anomalies = anomalies.round({'avg_sales': 1, 'change_pct': 1})
+    columns = ['type', 'sku', 'location', 'date', 'today_sales', 'avg_sales', 'change_pct']
+    return anomalies[[column for column in columns if column in anomalies.columns]]
+# --- END NEW FUNCTION ---
+
+
+# --- Shared chart spec: only the data changes between SKUs ---
+SALES_CHART = alt.Chart().mark_line().encode(x='date:T', y='sales:Q')
+
+
+# --- FUNCTION: Markdown to Plain Text (for the email body) ---
+def strip_md(md):
+    return md.replace("### ", "").replace("**", "").replace("`", "")
+# --- END NEW FUNCTION ---
+
+
+# --- FUNCTION: Background Email Queue ---
+# Emails are sent on a worker thread so the page doesn't wait on Brevo.
+# Results are picked up from session state on a later rerun. One worker,
+# because every send shares the pooled requests.Session.
+@st.cache_resource(show_spinner=False)
+def get_email_pool():
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+def queue_email(recipient_email, subject, body):
+    future = get_email_pool().submit(send_email, recipient_email, subject, body)
+    st.session_state.setdefault("send_futures", []).append(future)
+    st.info(f"Email to `{recipient_email}` queued. It is being sent in the background.")
+# --- END NEW FUNCTION ---
+
+
 # --- Get User Input (File Uploader) ---
 uploaded_file = st.file_uploader(
     "1. Upload your sales CSV file", 
@@ -150,6 +351,18 @@ if warn_on_slump:
 st.markdown("---")
 st.subheader("🚀 Take Action")
 
+# --- Report the results of emails queued on previous runs ---
+send_futures = st.session_state.get("send_futures", [])
+for future in [f for f in send_futures if f.done()]:
+    success, message = future.result()
+    if success:
+        st.success(message)
+    else:
+        st.error(message)
+    send_futures.remove(future)
+if send_futures:
+    st.info(f"{len(send_futures)} email(s) still being sent in the background...")
+
 if not recipient_email:
     st.warning("Please enter a recipient email (Step 2) to enable alert actions.")
     auto_send = False
@@ -164,120 +377,147 @@ st.markdown("---")
 if uploaded_file is not None:
     # Read the CSV file using pandas
     try:
-        df = pd.read_csv(uploaded_file)
-        df.columns = df.columns.str.strip().str.lower()
+        file_bytes = uploaded_file.getvalue()
+        file_sig = hashlib.sha256(file_bytes).hexdigest()
+        df = load_df(file_bytes)
 
         st.write("Columns Found:")
         st.write(df.columns.tolist())
         
-        try:
-            df['date'] = pd.to_datetime(df['date'])
-        except Exception as e:
-            st.warning(f"Could not parse dates. Charts may be incorrect. Error: {e}")
+        if df['date'].isna().any():
+            st.warning("Could not parse some dates. Charts may be incorrect.")
+
+        # Split the data per SKU once per upload; the charts and alerts below reuse it.
+        if st.session_state.get("file_sig") != file_sig:
+            st.session_state["file_sig"] = file_sig
+            st.session_state["sku_groups"] = {
+                sku: group.sort_values('date') for sku, group in df.groupby('sku', sort=False, observed=True)
+            }
+        sku_groups = st.session_state["sku_groups"]
         
         with st.expander("Click to see Data Preview"):
-            st.dataframe(df)
+            st.dataframe(df.head(200), use_container_width=True)
+            st.caption(f"Showing first {min(len(df), 200):,} of {len(df):,} rows")
         
         with st.expander("Click to see All Sales Charts 📊"):
-            unique_skus = df['sku'].unique()
-            for sku in unique_skus:
+            charted = set()
+            for sku, sku_data in sku_groups.items():
                 st.subheader(f"Sales Trend for: {sku}")
-                sku_data = df[df['sku'] == sku].sort_values('date')
-                st.line_chart(sku_data, x='date', y='sales')
+                st.altair_chart(SALES_CHART.properties(data=sku_data[['date', 'sales']]), use_container_width=True)
+                charted.add(sku)
         
-        data_as_text = df.to_string()
-
         if st.button("Analyze Sales Velocity"):
             
+            # --- Detect spikes/slumps locally; the AI only explains them ---
+            # Only re-run detection when the file or thresholds changed. Gemini
+            # is only called again when the resulting prompt changed.
+            analysis_key = (file_sig, alert_threshold, warn_on_slump, slump_threshold)
+            if st.session_state.get("analysis_key") != analysis_key:
+                st.session_state["anomalies"] = detect_anomalies(df, alert_threshold, warn_on_slump, slump_threshold)
+                st.session_state["analysis_key"] = analysis_key
+            anomalies = st.session_state["anomalies"]
+
             # --- Dynamically build prompt sections ---
-            slump_instructions = ""
             spinner_text = f"AI is analyzing for spikes > {alert_threshold}%..."
             subject_text = f"SUBJECT: 🚨 URGENT: Demand Spike Warning (Threshold: {alert_threshold}%)"
             
             if warn_on_slump:
-                slump_instructions = f"""
-                - **Task 3 (Slumps):** Check for sales >{slump_threshold}% *below* the 7-day average. A "Slump" is >{slump_threshold}% sales *lower* than the 7-day moving average.
-                """
                 spinner_text = f"AI is analyzing for spikes (>{alert_threshold}%) and slumps (<{slump_threshold}%)..."
                 subject_text = f"SUBJECT: 📈📉 Sales Velocity Alert (Spikes & Slumps Detected)"
 
-            # --- PROMPT (asking for JSON) ---
-            prompt = f"""
-            You are a "Sales Velocity Analyst".
-            Analyze the following sales DATA and consider the business CONTEXT.
-            Respond with *ONLY* a JSON list of all spikes and slumps, wrapped in ```json ... ``` tags.
-            If no issues are found, respond with an empty list: [].
-
-            DATA:
-            {data_as_text}
-
-            CURRENT BUSINESS CONTEXT:
-            {business_context}
-
-            YOUR TASKS:
-            1.  **Analyze Data:** Segregate by 'sku'.
-            2.  **Task 2 (Spikes):** Check for sales >{alert_threshold}% *above* the 7-day average.
-            {slump_instructions}
-
-            JSON FORMAT FOR EACH ISSUE:
-            {{
-                "type": "spike" or "slump",
-                "sku": "The SKU name",
-                "location": "The location",
-                "today_sales": "The most recent sales number",
-                "avg_sales": "The calculated 7-day average",
-                "change_pct": "The % increase or decrease",
-                "cause": "Your suggested cause, using business context if relevant."
-            }}
-            """
+            # --- PROMPT (asking for JSON), only needed if there is something to explain ---
+            prompt = None
+            if anomalies.empty:
+                spinner_text = "No anomalies found. Preparing the report..."
+            else:
+                anomalies_as_text = anomalies.to_csv(index=False, date_format='%Y-%m-%d')
+                slump_rule = ""
+                if warn_on_slump:
+                    slump_rule = f" and slump threshold: {slump_threshold}%"
+
+                prompt = f"""
+                You are a "Sales Velocity Analyst".
+                The ANOMALIES below were already detected by comparing each SKU's latest
+                sales against its 7-day moving average (spike threshold: {alert_threshold}%{slump_rule}).
+                Consider the business CONTEXT and explain each one.
+                Respond with *ONLY* a JSON list.
+
+                ANOMALIES (CSV):
+                {anomalies_as_text}
+
+                CURRENT BUSINESS CONTEXT:
+                {business_context}
+
+                YOUR TASK:
+                Write a short suggested "cause" for each SKU in ANOMALIES.
+
+                JSON FORMAT FOR EACH SKU:
+                {{
+                    "sku": "The SKU name, exactly as in ANOMALIES",
+                    "cause": "Your suggested cause, using business context if relevant."
+                }}
+                """
             
             with st.spinner(spinner_text):
                 try:
-                    response = model.generate_content(prompt)
+                    stream_placeholder = st.empty()
+                    if prompt is None:
+                        # Nothing to explain, so skip the Gemini round-trip.
+                        response_text = "[]"
+                    else:
+                        response_text = stream_gemini(prompt, stream_placeholder)
                     st.success("Analysis Complete!")
                     st.markdown("### 🤖 AI-Generated Visual Report")
                     
                     try:
-                        json_text = response.text.strip().replace("```json", "").replace("```", "")
-                        alerts = json.loads(json_text)
+                        alerts = json.loads(response_text)
+                        causes = {str(alert['sku']): alert['cause'] for alert in alerts}
                         
-                        email_body_text = "Hi Team,\n\nMy analysis is complete. Here are the findings:\n\n"
+                        email_parts = ["Hi Team,\n\nMy analysis is complete. Here are the findings:\n\n"]
                         
-                        if not alerts:
+                        if anomalies.empty:
                             st.markdown("All SKUs are operating within normal sales velocity. No warnings to report.")
-                            email_body_text += "All SKUs are operating within normal sales velocity. No warnings to report."
+                            email_parts.append("All SKUs are operating within normal sales velocity. No warnings to report.")
                         else:
-                            for alert in alerts:
-                                if alert['type'] == 'spike':
-                                    st.markdown("---")
-                                    st.markdown(f"### ⚠️ SPIKE WARNING (>{alert_threshold}%)")
-                                    email_body_text += f"--- \n ⚠️ SPIKE WARNING (>{alert_threshold}%) \n"
+                            for anomaly in anomalies.to_dict('records'):
+                                if anomaly['type'] == 'spike':
+                                    heading = f"⚠️ SPIKE WARNING (>{alert_threshold}%)"
                                 else:
-                                    st.markdown("---")
-                                    st.markdown(f"### 📉 SLUMP WARNING (>{slump_threshold}%)")
-                                    email_body_text += f"--- \n 📉 SLUMP WARNING (>{slump_threshold}%) \n"
-
-                                # --- Display visual report in Streamlit ---
-                                st.markdown(f"* **SKU:** `{alert['sku']}`")
-                                st.markdown(f"* **Location:** `{alert['location']}`")
-                                st.markdown(f"* **Today's Sales:** `{alert['today_sales']}`")
-                                st.markdown(f"* **7-Day Average:** `{alert['avg_sales']}`")
-                                st.markdown(f"* **Change:** `{alert['change_pct']}%`")
-                                st.markdown(f"* **Suggested Cause:** {alert['cause']}")
-                                st.markdown(f"**Data for {alert['sku']}:**")
-                                sku_data = df[df['sku'] == alert['sku']].sort_values('date')
-                                st.line_chart(sku_data, x='date', y='sales')
+                                    heading = f"📉 SLUMP WARNING (>{slump_threshold}%)"
+                                cause = causes.get(str(anomaly['sku']), "No cause suggested.")
+
+                                # --- Display visual report in Streamlit (one message per alert) ---
+                                alert_lines = [
+                                    "---",
+                                    f"### {heading}",
+                                    f"* **SKU:** `{anomaly['sku']}`",
+                                ]
+                                if 'location' in anomaly:
+                                    alert_lines.append(f"* **Location:** `{anomaly['location']}`")
+                                alert_lines += [
+                                    f"* **Today's Sales:** `{anomaly['today_sales']}`",
+                                    f"* **7-Day Average:** `{anomaly['avg_sales']}`",
+                                    f"* **Change:** `{anomaly['change_pct']}%`",
+                                    f"* **Suggested Cause:** {cause}",
+                                ]
+                                alert_md = "\n".join(alert_lines)
+                                st.markdown(alert_md)
+                                # --- Don't send the same chart to the browser twice ---
+                                sku_data = sku_groups.get(anomaly['sku'])
+                                if anomaly['sku'] in charted:
+                                    st.markdown(f"_See the chart for {anomaly['sku']} under **All Sales Charts** above._")
+                                elif sku_data is not None:
+                                    st.markdown(f"**Data for {anomaly['sku']}:**")
+                                    st.altair_chart(SALES_CHART.properties(data=sku_data[['date', 'sales']]), use_container_width=True)
                                 
-                                # --- Add this alert's info to the email body string ---
-                                email_body_text += f"* SKU: {alert['sku']} \n"
-                                email_body_text += f"* Location: {alert['location']} \n"
-                                email_body_text += f"* Today's Sales: {alert['today_sales']} \n"
-                                email_body_text += f"* 7-Day Average: {alert['avg_sales']} \n"
-                                email_body_text += f"* Change: {alert['change_pct']}% \n"
-                                email_body_text += f"* Suggested Cause: {alert['cause']} \n\n"
+                                # --- Add this alert's info to the email body ---
+                                email_parts.append(strip_md(alert_md) + "\n\n")
                         
+                        # The report replaces the raw streamed JSON.
+                        stream_placeholder.empty()
                         st.markdown("---")
-                        email_body_text += "\n\nBest,\nSales Velocity Agent"
+                        email_parts.append("\n\nBest,\nSales Velocity Agent")
+                        email_body_text = "".join(email_parts)
                         
                         # --- AUTONOMOUS LOGIC ---
                         subject_clean = subject_text.replace("SUBJECT: ", "")
@@ -285,44 +525,27 @@ if uploaded_file is not None:
                         if auto_send:
                             # User wants it sent NOW.
                             st.info(f"Autonomous mode enabled. Sending alert to `{recipient_email}`...")
-                            with st.spinner("Sending email ..."):
-                                success, message = send_email(
-                                    recipient_email, 
-                                    subject_clean, 
-                                    email_body_text
-                                )
-                            if success:
-                                st.success(message)
-                            else:
-                                st.error(message)
-                            # Errors are handled by the function
+                            queue_email(recipient_email, subject_clean, email_body_text)
+                            # Errors are reported on the next run
                         
                         else:
                             # User wants to review first. Show the button.
                             st.markdown(f"**Ready to send the report to:** `{recipient_email}`")
                             if st.button("Click Here to Send the Email Alert", use_container_width=True):
-                                with st.spinner("Sending email..."):
-                                    success, message = send_email(
-                                        recipient_email, 
-                                        subject_clean, 
-                                        email_body_text
-                                    )
-                                if success:
-                                    st.success(message)
-                                else:
-                                    st.error(message)
+                                queue_email(recipient_email, subject_clean, email_body_text)
                         # --- NEW: "VIBE CODE" REVEALER ---
-                        st.markdown("---")
-                        with st.expander("Click here to see the *exact* prompt sent to the AI (The 'Vibe Code')"):
-                            st.code(prompt, language="text")
+                        if prompt is not None:
+                            st.markdown("---")
+                            with st.expander("Click here to see the *exact* prompt sent to the AI (The 'Vibe Code')"):
+                                st.code(prompt, language="text")
                         # --- END NEW SECTION ---
 
                     except json.JSONDecodeError:
                         st.error("Error: The AI's response was not in the correct JSON format. Here is the raw text:")
-                        st.text(response.text)
+                        st.text(response_text)
                     except Exception as e:
                         st.error(f"Error while processing alerts: {e}")
-                        st.text(f"Raw AI response: {response.text}")
+                        st.text(f"Raw AI response: {response_text}")
 
                 except Exception as e:
                      st.error("Unable to connect with Gemini API. Please try again later.")